@@ -5,6 +5,16 @@ import sys
 from setuptools import setup
 from setuptools.command.test import test as TestCommand
 
+try:
+    # Optional: compile the hot modules with Cython in pure-Python mode.
+    # The .py sources remain the importable fallback when Cython (or a C
+    # compiler) is unavailable, so this never gates installation.
+    from Cython.Build import cythonize
+    ext_modules = cythonize(['vcproj/project.py', 'vcproj/solution.py'],
+                            language_level=3)
+except ImportError:
+    ext_modules = []
+
 
 class PyTest(TestCommand):
     def finalize_options(self):
@@ -28,6 +38,7 @@ setup(
     url='http://github.com/jhandley/pyvcproj',
     py_modules=['vcproj'],
     packages=['vcproj'],
+    ext_modules=ext_modules,
     cmdclass={'test': PyTest},
-    python_requires='>=3.6',
+    python_requires='>=3.8',
 )
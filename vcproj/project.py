@@ -1,7 +1,15 @@
 """Visual C++ project file."""
 
+import functools
 import re
-import xml.etree.ElementTree as ET
+import sys
+
+try:
+    from lxml import etree as ET
+    _HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _HAVE_LXML = False
 
 __all__ = ['Project', 'parse']
 
@@ -10,13 +18,87 @@ _REGEX_CONFIG_CONDITION = re.compile(r"'\$\(Configuration\)\|\$\(Platform\)'=='(
 _NS = {'MSB': _MS_BUILD_NAMESPACE}
 
 
-def parse(filename):
-    """Parse project file filename and return Project instance."""
+if _HAVE_LXML:
+    def _compile_xpath(path):
+        """Compile *path* once so repeated queries skip XPath parsing."""
+        return ET.XPath(path, namespaces=_NS)
+else:
+    def _compile_xpath(path):
+        """Stdlib fallback: findall with the path bound in a closure."""
+        def findall(elem):
+            return elem.findall(path, _NS)
+        return findall
+
+
+_XP_PROPERTY_GROUPS = _compile_xpath('./MSB:PropertyGroup')
+_XP_ITEM_DEFINITION_GROUPS = _compile_xpath('./MSB:ItemDefinitionGroup')
+
+if _HAVE_LXML:
+    # Matches the Condition attribute inside libxml2; the $condition variable
+    # is bound per call, so the expression itself compiles only once.
+    _XP_ITEM_DEFINITION_GROUPS_FOR_CONDITION = ET.XPath(
+        './MSB:ItemDefinitionGroup[@Condition=$condition]', namespaces=_NS)
+
+
+@functools.lru_cache(maxsize=None)
+def _clark_tag(name):
+    """Clark-notation tag for *name* in the MSBuild namespace."""
+    # Interning makes the tag comparisons in tree walks pointer comparisons.
+    return sys.intern(f'{{{_MS_BUILD_NAMESPACE}}}{name}')
+
+
+@functools.lru_cache(maxsize=None)
+def _msb_path(*names):
+    """Prefixed find() path for *names*; item names form a small vocabulary,
+    so each path string is formatted only once."""
+    return sys.intern('/'.join(f'MSB:{name}' for name in names))
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_findall(*names):
+    """Compiled all-matches finder for the 'MSB:a/MSB:b' path to *names*."""
+    if _HAVE_LXML:
+        return ET.XPath(_msb_path(*names), namespaces=_NS)
+
+    def findall(elem, path=_msb_path(*names)):
+        return elem.findall(path, _NS)
+    return findall
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_find(*names):
+    """Compiled first-match-or-None finder for the path to *names*."""
+    if _HAVE_LXML:
+        xpath = _compiled_findall(*names)
+
+        def find(elem):
+            found = xpath(elem)
+            return found[0] if found else None
+    else:
+        def find(elem, path=_msb_path(*names)):
+            return elem.find(path, _NS)
+    return find
+
+
+def parse(filename, lazy=False):
+    """Parse project file filename and return Project instance.
+
+    With lazy=True only the source/include file lists are scanned via
+    iterparse, without keeping the full XML tree in memory; the returned
+    instance supports the read-only file queries but not setters.
+    """
+    if lazy:
+        return Project.from_iterparse(filename)
     return Project(filename)
 
 
+@functools.lru_cache(maxsize=None)
 def _parse_config_condition(condition):
-    return _REGEX_CONFIG_CONDITION.match(condition).groups()
+    # Condition attributes are drawn from the project's small set of
+    # (configuration, platform) pairs, so each distinct string is parsed once.
+    # fullmatch anchors at both ends, rejecting trailing junk for free.
+    m = _REGEX_CONFIG_CONDITION.fullmatch(condition)
+    return m.group(1), m.group(2)
 
 
 def _matches_platform_configuration(condition, platform, configuration):
@@ -24,6 +106,21 @@ def _matches_platform_configuration(condition, platform, configuration):
     return (platform == 'All Configurations' or p == platform) and (configuration == 'All Configurations' or c == configuration)
 
 
+# Marks a Condition that is not a configuration|platform comparison (e.g.
+# "'$(UseFoo)'=='true'", which MSBuild allows); such groups can never match a
+# (platform, configuration) pair, unlike None which means 'no condition'.
+_NON_CONFIG_CONDITION = object()
+
+
+def _matches_parsed_condition(parsed, platform, configuration):
+    if parsed is None:
+        return True
+    if parsed is _NON_CONFIG_CONDITION:
+        return False
+    (p, c) = parsed
+    return (platform == 'All Configurations' or p == platform) and (configuration == 'All Configurations' or c == configuration)
+
+
 class Project(object):
     """Visual C++ project file (.vcxproj)."""
 
@@ -32,18 +129,90 @@ class Project(object):
         self.filename = filename
         self.xml = ET.parse(filename)
 
+    @classmethod
+    def from_iterparse(cls, filename, wanted=('ClCompile', 'ClInclude')):
+        """Scan *filename* for the file lists named in *wanted* without
+        building the full tree; elements are discarded as they are parsed,
+        so peak memory stays flat regardless of project size."""
+        files = {name: [] for name in wanted}
+        tags = {_clark_tag(name): name for name in wanted}
+        if _HAVE_LXML:
+            for _, elem in ET.iterparse(filename, events=('end',)):
+                name = tags.get(elem.tag)
+                if name is not None and 'Include' in elem.attrib:
+                    files[name].append(elem.attrib['Include'])
+                elem.clear()
+                # Detach already-processed siblings so the element skeleton
+                # does not accumulate under the root.
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+        else:
+            context = ET.iterparse(filename, events=('start', 'end'))
+            _, root = next(context)
+            for event, elem in context:
+                if event != 'end':
+                    continue
+                name = tags.get(elem.tag)
+                if name is not None and 'Include' in elem.attrib:
+                    files[name].append(elem.attrib['Include'])
+                elem.clear()
+                # Drop completed top-level subtrees; the parser keeps the
+                # open-element chain alive until their end events fire.
+                root.clear()
+        project = cls.__new__(cls)
+        project.filename = filename
+        project.xml = None
+        project._lazy_files = files
+        return project
+
     def configuration_type(self):
         """Project type (Application, StaticLibrary or DynamicLibrary)."""
+        return self._configuration_type
+
+    @functools.cached_property
+    def _configuration_type(self):
+        # Invariant for a loaded project, so walk the PropertyGroups only once.
         return self.__property_group_item_for_config('All Configurations', 'All Configurations', 'Configuration', 'ConfigurationType')
 
+    @functools.cached_property
+    def _property_groups_by_label(self):
+        # Label -> [(group, parsed Condition)] in document order, built once
+        # so repeated accessors locate their group without a tree walk.
+        index = {}
+        for group in _XP_PROPERTY_GROUPS(self.xml):
+            condition = group.attrib.get('Condition', None)
+            if condition is None:
+                parsed = None
+            else:
+                match = _REGEX_CONFIG_CONDITION.fullmatch(condition)
+                parsed = (match.group(1), match.group(2)) if match else _NON_CONFIG_CONDITION
+            index.setdefault(group.attrib.get('Label', None), []).append((group, parsed))
+        return index
+
+    def invalidate_caches(self):
+        """Drop cached values derived from the XML; call after mutating self.xml directly."""
+        self.__dict__.pop('_configuration_type', None)
+        self.__dict__.pop('_property_groups_by_label', None)
+        self.__dict__.pop('_item_definition_groups', None)
+
     def configurations(self, platform='All Configurations', configuration='All Configurations'):
         """List available configurations for this project as list of tuples (config, platform)"""
-        item_groups = self.xml.findall('./MSB:ItemGroup', _NS)
-        config_groups = (item_group for item_group in item_groups if item_group.attrib.get('Label', None) == 'ProjectConfigurations')
+        config_groups = (item_group for item_group in self.xml.getroot().iterfind('MSB:ItemGroup', _NS)
+                         if item_group.attrib.get('Label', None) == 'ProjectConfigurations')
         config_group = next(config_groups, None)
+        configuration_tag = _clark_tag('Configuration')
+        platform_tag = _clark_tag('Platform')
         for config_item in config_group:
-            item_config = config_item.find('./MSB:Configuration', _NS).text
-            item_platform = config_item.find('./MSB:Platform', _NS).text
+            # Each ProjectConfiguration holds one Configuration and one
+            # Platform child; read both in a single pass over the children.
+            item_config = item_platform = None
+            for child in config_item:
+                if child.tag == configuration_tag:
+                    item_config = child.text
+                elif child.tag == platform_tag:
+                    item_platform = child.text
             if (platform == 'All Configurations' or item_platform == platform) and (configuration == 'All Configurations' or item_config == configuration):
                 yield (item_config, item_platform)
 
@@ -57,41 +226,65 @@ class Project(object):
 
     def generic_files(self, name):
         """Function to find files based on a given name/type."""
-        return [c.attrib['Include'] for c in self.xml.findall(f'.//MSB:{name}', _NS) if 'Include' in c.attrib]
+        if self.xml is None:
+            # Lazily parsed: serve from the lists captured by from_iterparse.
+            try:
+                return list(self._lazy_files[name])
+            except KeyError:
+                raise ValueError(f'{name} was not scanned during lazy parsing') from None
+        # File items only live under top-level ItemGroups, so iterate those
+        # directly instead of an .// XPath scan over the whole tree.
+        tag = _clark_tag(name)
+        return [c.attrib['Include']
+                for item_group in self.xml.getroot().iterfind('MSB:ItemGroup', _NS)
+                for c in item_group.iter(tag)
+                if 'Include' in c.attrib]
+
+    @functools.cached_property
+    def _item_definition_groups(self):
+        # [(group, parsed Condition)] in document order, so the per-config
+        # accessors skip the findall and condition parse on repeat calls.
+        return [(group, _parse_config_condition(group.attrib['Condition']))
+                for group in _XP_ITEM_DEFINITION_GROUPS(self.xml)]
 
     def __item_groups_for_config(self, platform, configuration):
-        groups = self.xml.findall('./MSB:ItemDefinitionGroup', _NS)
-        return list(filter(lambda g: _matches_platform_configuration(g.attrib['Condition'], platform, configuration), groups))
+        if (_HAVE_LXML and '_item_definition_groups' not in self.__dict__
+                and platform != 'All Configurations' and configuration != 'All Configurations'):
+            # One-off specific query: let libxml2 select on the attribute
+            # directly rather than building the parsed-condition index.
+            condition = f"'$(Configuration)|$(Platform)'=='{platform}|{configuration}'"
+            return _XP_ITEM_DEFINITION_GROUPS_FOR_CONDITION(self.xml, condition=condition)
+        return [group for (group, (p, c)) in self._item_definition_groups
+                if (platform == 'All Configurations' or p == platform)
+                and (configuration == 'All Configurations' or c == configuration)]
 
     def __item_group_item_for_config(self, platform, configuration, subgroup_name, item_name):
         groups = self.__item_groups_for_config(platform, configuration)
         if len(groups) == 0:
             return None
-        item = groups[0].find(f'MSB:{subgroup_name}/MSB:{item_name}', _NS)
+        item = _compiled_find(subgroup_name, item_name)(groups[0])
         return item.text if item is not None else None
 
     def __set_item_group_items_for_config(self, platform, configuration, subgroup_name, item_name, val):
         groups = self.__item_groups_for_config(platform, configuration)
         for group in groups:
-            subgroup = group.find(f'MSB:{subgroup_name}', _NS)
+            subgroup = _compiled_find(subgroup_name)(group)
             if subgroup is None:
                 continue
-            item = subgroup.find(f'MSB:{item_name}', _NS)
+            item = _compiled_find(item_name)(subgroup)
             if val is None:
                 # remove the node to get 'inherit from project defaults'
                 if item is not None:
                     subgroup.remove(item)
             else:
                 if item is None:
-                    item = ET.SubElement(subgroup, f'{{{_MS_BUILD_NAMESPACE}}}{item_name}')
+                    item = ET.SubElement(subgroup, _clark_tag(item_name))
                 item.text = val
 
     def __property_group_item_for_config(self, platform, configuration, label, item_name):
-        property_groups = self.xml.findall('./MSB:PropertyGroup', _NS)
-        matching_groups = (group for group in property_groups if group.attrib.get('Label', None) == label)
-        for group in matching_groups:
-            if 'Condition' not in group.attrib or _matches_platform_configuration(group.attrib['Condition'], platform, configuration):
-                items = group.findall(f'MSB:{item_name}', _NS)
+        for (group, parsed) in self._property_groups_by_label.get(label, []):
+            if _matches_parsed_condition(parsed, platform, configuration):
+                items = _compiled_findall(item_name)(group)
                 for item in items:
                     if item is not None:
                         if 'Condition' not in item.attrib or _matches_platform_configuration(item.attrib['Condition'], platform, configuration):
@@ -101,44 +294,47 @@ class Project(object):
     def __set_property_group_items_for_config(self, platform, configuration, label, item_name, val):
         if platform == 'All Configurations' or configuration == 'All Configurations':
             # Gets too hairy to handle wild cards in the code below when new items need to be created
-            # so ensure that we always call with specific configs.
-            for config in self.configurations(platform, configuration):
-                self.__set_property_group_items_for_config(config[0], config[1], label, item_name, val)
+            # so expand the wild cards into the list of specific configs up front.
+            targets = list(self.configurations(platform, configuration))
         else:
-            property_groups = self.xml.findall('./MSB:PropertyGroup', _NS)
-            label_matching_groups = (group for group in property_groups if group.attrib.get('Label', None) == label)
-            condition_matching_groups = (g for g in label_matching_groups
-                                         if 'Condition' not in g.attrib or
-                                         _matches_platform_configuration(g.attrib['Condition'], platform, configuration))
-            group = next(condition_matching_groups, None)
-            if group is not None:
-                group_condition = group.attrib.get('Condition', None)
-                # In some files there are multiple group nodes each with a condition and on other files
-                # (ones imported from earlier versions of Visual Studio maybe?) there is a single group node
-                # and each child has a condition.
-                if group_condition is None:
-                    # No condition on group, must be conditions on the items
-                    items = group.findall(f'MSB:{item_name}', _NS)
-                    item = next((item for item in items if _matches_platform_configuration(item.attrib['Condition'], platform, configuration)), None)
-                    if val is None:
-                        if item is not None:
-                            # remove the node to get 'inherit from project defaults'
-                            group.remove(item)
-                    else:
-                        if item is None:
-                            item = ET.SubElement(group, f'{{{_MS_BUILD_NAMESPACE}}}{item_name}')
-                            item.attrib['Condition'] = f"'$(Configuration)|$(Platform)'=='{configuration}|{platform}'"
-                        item.text = val
+            targets = [(platform, configuration)]
+        self.__apply_property_group_item(targets, label, item_name, val)
+
+    def __apply_property_group_item(self, targets, label, item_name, val):
+        # Locate the label's groups through the prebuilt index, then
+        # multicast the mutation to every (platform, configuration) target.
+        label_groups = self._property_groups_by_label.get(label, [])
+        for (platform, configuration) in targets:
+            group = next((g for (g, parsed) in label_groups
+                          if _matches_parsed_condition(parsed, platform, configuration)), None)
+            if group is None:
+                continue
+            # In some files there are multiple group nodes each with a condition and on other files
+            # (ones imported from earlier versions of Visual Studio maybe?) there is a single group node
+            # and each child has a condition.
+            if 'Condition' not in group.attrib:
+                # No condition on group, must be conditions on the items
+                items = _compiled_findall(item_name)(group)
+                item = next((item for item in items if _matches_platform_configuration(item.attrib['Condition'], platform, configuration)), None)
+                if val is None:
+                    if item is not None:
+                        # remove the node to get 'inherit from project defaults'
+                        group.remove(item)
+                else:
+                    if item is None:
+                        item = ET.SubElement(group, _clark_tag(item_name))
+                        item.attrib['Condition'] = f"'$(Configuration)|$(Platform)'=='{configuration}|{platform}'"
+                    item.text = val
+            else:
+                # condition on group so none on items
+                item = _compiled_find(item_name)(group)
+                if val is None:
+                    if item is not None:
+                        # remove the node to get 'inherit from project defaults'
+                        group.remove(item)
                 else:
-                    # condition on group so none on items
-                    item = group.find(f'MSB:{item_name}', _NS)
-                    if val is None:
-                        if item is not None:
-                            # remove the node to get 'inherit from project defaults'
-                            group.remove(item)
-                    else:
-                        if item is None:
-                            item = ET.SubElement(group, f'{{{_MS_BUILD_NAMESPACE}}}{item_name}')
+                    if item is None:
+                        item = ET.SubElement(group, _clark_tag(item_name))
                     item.text = val
 
     def additional_link_dependencies(self, platform, configuration):
@@ -2,10 +2,26 @@
 
 __all__ = ['Solution', 'parse']
 
+import os
 import re
-from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import vcproj.project
+
+
+class _Project:
+    """A project entry parsed from a solution file."""
+
+    __slots__ = ('type_guid', 'name', 'path', 'guid', 'dependencies')
+
+    def __init__(self, type_guid, name, path, guid, dependencies):
+        self.type_guid = type_guid
+        self.name = name
+        self.path = path
+        self.guid = guid
+        self.dependencies = dependencies
+
 
-_Project = namedtuple('_Project', 'type_guid,name,path,guid,dependencies')
 _GUID = r'\{[\w-]+\}'
 _REGEX_PROJECT_FILE = re.compile(rf'''
     Project\("({_GUID})"\)  # type_guid
@@ -16,8 +32,8 @@ _REGEX_PROJECT_FILE = re.compile(rf'''
 ''', re.X)
 _REGEX_END_PROJECT = re.compile(r'\s*EndProject')
 _REGEX_PROJECT_DEPENDENCIES_SECTION = re.compile(r'\s*ProjectSection\((\w+)\) = postProject')
-_REGEX_END_PROJECT_SECTION = re.compile(r'\s*EndProjectSection')
-_REGEX_DEPENDENCY = re.compile(rf'\s*({_GUID})\s*=\s*({_GUID})')
+# Single alternation so each dependency-section line needs one regex pass.
+_REGEX_DEPENDENCY_OR_END = re.compile(rf'\s*(?:(?P<end>EndProjectSection)|(?P<dep>{_GUID})\s*=\s*{_GUID})')
 
 
 def parse(filename):
@@ -36,103 +52,150 @@ class Solution(object):
         """Create a Solution instance for solution file *name*."""
         self.filename = filename
         self.projects = []
+        match_project = _REGEX_PROJECT_FILE.match
         with open(self.filename, encoding='utf-8-sig') as f:
-            line = f.readline()
-            while line:
-                line = f.readline()
-                if line.startswith('Project'):
-                    match = _REGEX_PROJECT_FILE.match(line)
-                    if match:
-                        self.projects.append(Solution.__read_project(match.groups(), f))
-                    else:
-                        print(f'No MATCH: {line}')
-                elif line.startswith('Global'):
-                    self.globals = Solution.__read_global(f)
+            lines = f.read().splitlines()
+        i, n = 0, len(lines)
+        while i < n:
+            line = lines[i]
+            i += 1
+            # Almost every line is indented section content; checking the
+            # first character skips the startswith/regex work for those.
+            first = line[:1]
+            if first == 'P' and line.startswith('Project'):
+                match = match_project(line)
+                if match:
+                    project, i = Solution.__read_project(match.groups(), lines, i)
+                    self.projects.append(project)
+                else:
+                    print(f'No MATCH: {line}')
+            elif first == 'G' and line.startswith('Global'):
+                self.globals, i = Solution.__read_global(lines, i)
+        self._projects_by_name = {p.name: p for p in self.projects}
+        self._projects_by_guid = {p.guid: p for p in self.projects}
 
     @staticmethod
-    def __read_project(project, f):
+    def __read_project(project, lines, i):
         dependencies = []
+        match_end = _REGEX_END_PROJECT.match
+        match_section = _REGEX_PROJECT_DEPENDENCIES_SECTION.match
+        n = len(lines)
         while True:
-            line = f.readline()
-            if line is None:
+            if i >= n:
                 raise SolutionFileError("Missing end project")
-            if _REGEX_END_PROJECT.match(line):
+            line = lines[i]
+            i += 1
+            if match_end(line):
                 break
-            if _REGEX_PROJECT_DEPENDENCIES_SECTION.match(line):
-                dependencies = Solution.__read_dependencies(f)
-        return _Project(*project, dependencies)
+            if match_section(line):
+                dependencies, i = Solution.__read_dependencies(lines, i)
+        return _Project(*project, dependencies), i
 
     @staticmethod
-    def __read_dependencies(f):
+    def __read_dependencies(lines, i):
         dependencies = []
+        match_line = _REGEX_DEPENDENCY_OR_END.match
+        n = len(lines)
         while True:
-            line = f.readline()
-            if line is None:
+            if i >= n:
                 raise SolutionFileError("Missing end dependencies section")
-            if _REGEX_END_PROJECT_SECTION.match(line):
+            line = lines[i]
+            i += 1
+            match = match_line(line)
+            if match is None:
+                # Unrecognized lines (blank lines, stray metadata) are
+                # skipped, as the separate-regex version did.
+                continue
+            if match.group('end'):
                 break
-            match = _REGEX_DEPENDENCY.match(line)
-            if match:
-                dependencies.append(match.group(1))
-        return dependencies
+            dependency = match.group('dep')
+            if dependency:
+                dependencies.append(dependency)
+        return dependencies, i
 
     @staticmethod
-    def __read_global(f):
+    def __read_global(lines, i):
         globals = []
+        n = len(lines)
         while True:
-            line = f.readline()
-            if line is None:
+            if i >= n:
                 raise SolutionFileError("Missing end global")
+            line = lines[i]
+            i += 1
             if line.startswith('EndGlobal'):
                 break
             globals.append(line.rstrip())
-        return globals
+        return globals, i
 
     def project_files(self):
         """List project files (.vcxproj.) in solution."""
-        return map(lambda p: p.path, self.projects)
+        return (p.path for p in self.projects)
 
     def project_names(self):
         """List project files (.vcxproj.) in solution."""
-        return map(lambda p: p.name, self.projects)
+        return (p.name for p in self.projects)
 
     def dependencies(self, project_name):
         """List names of projects dependent on project *project_name*"""
         project = self.__project_from_name(project_name)
         if not project:
             raise SolutionFileError(f"Can't find project with name {project_name}")
-        return map(lambda d: self.__project_from_id(d).name, project.dependencies)
+        return (self.__project_from_id(d).name for d in project.dependencies)
 
     def set_dependencies(self, project_name, dependencies):
         """Set names of projects dependent on project *project_name* to *dependencies*"""
         project = self.__project_from_name(project_name)
         if not project:
             raise SolutionFileError(f"Can't find project with name {project_name}")
-        project.dependencies.clear()
-        project.dependencies.extend(self.__project_from_name(d).guid for d in dependencies)
+        project.dependencies = [self.__project_from_name(d).guid for d in dependencies]
 
     def __project_from_name(self, project_name):
-        return next((p for p in self.projects if p.name == project_name), None)
+        return self._projects_by_name.get(project_name)
 
     def __project_from_id(self, project_id):
-        return next(filter(lambda p: p.guid == project_id, self.projects))
+        return self._projects_by_guid[project_id]
+
+    def load_all_projects(self, workers=None, progress=None):
+        """Parse every project file in the solution and return a dict mapping
+        the solution-relative path to its Project instance.
+
+        The files are independent, so they are parsed concurrently by a
+        thread pool of up to *workers* threads (libxml2 releases the GIL
+        while parsing). *progress*, if given, is called with each path as
+        its project finishes loading.
+        """
+        solution_dir = os.path.dirname(self.filename)
+
+        def load(path):
+            project = vcproj.project.parse(os.path.join(solution_dir, path.replace('\\', os.sep)))
+            if progress is not None:
+                progress(path)
+            return project
+
+        paths = list(self.project_files())
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(paths, executor.map(load, paths)))
 
     def write(self, filename=None):
         """Save solution file."""
         filename = filename or self.filename
-        with open(filename, 'w', encoding='utf-8-sig', newline='\r\n') as f:
-            print(file=f)
-            print('Microsoft Visual Studio Solution File, Format Version 11.00', file=f)
-            print('# Visual Studio 2010', file=f)
-            for p in self.projects:
-                print(f'Project("{p.type_guid}") = "{p.name}", "{p.path}", "{p.guid}"', file=f)
-                if p.dependencies:
-                    print('\tProjectSection(ProjectDependencies) = postProject', file=f)
-                    for d in p.dependencies:
-                        print(f'\t\t{d} = {d}', file=f)
-                    print('\tEndProjectSection', file=f)
-                print('EndProject', file=f)
-            print('Global', file=f)
-            for g in self.globals:
-                print(f'{g}', file=f)
-            print('EndGlobal', file=f)
+        # Assemble the file in memory and write it in one call; the explicit
+        # \r\n endings mean no per-line newline translation is needed.
+        out = ['\r\n',
+               'Microsoft Visual Studio Solution File, Format Version 11.00\r\n',
+               '# Visual Studio 2010\r\n']
+        for p in self.projects:
+            out.append(f'Project("{p.type_guid}") = "{p.name}", "{p.path}", "{p.guid}"\r\n')
+            if p.dependencies:
+                out.append('\tProjectSection(ProjectDependencies) = postProject\r\n')
+                for d in p.dependencies:
+                    out.append(f'\t\t{d} = {d}\r\n')
+                out.append('\tEndProjectSection\r\n')
+            out.append('EndProject\r\n')
+        out.append('Global\r\n')
+        for g in self.globals:
+            out.append(g)
+            out.append('\r\n')
+        out.append('EndGlobal\r\n')
+        with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
+            f.write(''.join(out))
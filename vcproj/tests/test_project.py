@@ -1,6 +1,20 @@
+import tempfile
+
 import vcproj.project
 
 
+def _parse_with_extra_property_group(extra_group):
+    """Parse test.vcxproj with *extra_group* inserted after the UserMacros group."""
+    with open('vcproj/tests/test_solution/test/test.vcxproj', encoding='utf-8-sig') as f:
+        xml = f.read()
+    xml = xml.replace('<PropertyGroup Label="UserMacros" />',
+                      f'<PropertyGroup Label="UserMacros" />\n  {extra_group}')
+    temp = tempfile.NamedTemporaryFile(mode='w', suffix='.vcxproj', delete=False, encoding='utf-8')
+    temp.write(xml)
+    temp.close()
+    return vcproj.project.parse(temp.name)
+
+
 def test_source_files():
     p = vcproj.project.parse('vcproj/tests/test_solution/test/test.vcxproj')
     assert list(p.source_files()) == ['stdafx.cpp', 'test.cpp']
@@ -11,6 +25,12 @@ def test_include_files():
     assert list(p.include_files()) == ['Resource.h', 'stdafx.h', 'targetver.h', 'test.h']
 
 
+def test_lazy_parse():
+    p = vcproj.project.parse('vcproj/tests/test_solution/test/test.vcxproj', lazy=True)
+    assert list(p.source_files()) == ['stdafx.cpp', 'test.cpp']
+    assert list(p.include_files()) == ['Resource.h', 'stdafx.h', 'targetver.h', 'test.h']
+
+
 def test_configurations():
     p = vcproj.project.parse('vcproj/tests/test_solution/test/test.vcxproj')
     assert list(p.configurations()) == [('Debug', 'Win32'), ('Release', 'Win32')]
@@ -92,6 +112,23 @@ def test_set_output_directory():
     assert p.output_directory('Release', 'Win32') == 'C:\\foo\\bar'
 
 
+def test_set_with_non_config_condition_group():
+    # MSBuild allows conditions that are not configuration|platform
+    # comparisons; groups carrying one must be skipped, not an error.
+    p = _parse_with_extra_property_group('<PropertyGroup Label="UserStuff" Condition="\'$(UseFoo)\'==\'true\'" />')
+    p.set_output_directory('Debug', 'Win32', 'C:\\foo\\bar')
+    assert p.output_directory('Debug', 'Win32') == 'C:\\foo\\bar'
+
+
+def test_set_skips_non_config_condition_group_with_matching_label():
+    # The unlabeled group matches the setter's label but its condition can
+    # never match a config; the wildcard setter must pass over it.
+    p = _parse_with_extra_property_group('<PropertyGroup Condition="\'$(UseFoo)\'==\'true\'"><OutDir>unused</OutDir></PropertyGroup>')
+    p.set_output_directory('All Configurations', 'All Configurations', 'C:\\foo\\bar')
+    assert p.output_directory('Debug', 'Win32') == 'C:\\foo\\bar'
+    assert p.output_directory('Release', 'Win32') == 'C:\\foo\\bar'
+
+
 def test_program_database_file():
     p = vcproj.project.parse('vcproj/tests/test_solution/test/test.vcxproj')
     assert p.program_database_file('Debug', 'Win32') == '$(TargetDir)test.pdb'
@@ -23,11 +23,30 @@ def test_project_names(test_sol):
     assert list(test_sol.project_names()) == ['test', 'lib1', 'lib2']
 
 
+def test_dependencies_section_with_blank_line():
+    with open('vcproj/tests/test_solution/vc2010.sln', encoding='utf-8-sig') as f:
+        text = f.read()
+    text = text.replace('\tProjectSection(ProjectDependencies) = postProject\n',
+                        '\tProjectSection(ProjectDependencies) = postProject\n\n')
+    temp = tempfile.NamedTemporaryFile(mode='w', suffix='.sln', delete=False, encoding='utf-8-sig')
+    temp.write(text)
+    temp.close()
+    s = vcproj.solution.parse(temp.name)
+    assert list(s.dependencies('test')) == ['lib1', 'lib2']
+
+
 def test_set_dependencies(test_sol):
     test_sol.set_dependencies('lib1', ['lib2'])
     assert list(test_sol.dependencies('lib1')) == ['lib2']
 
 
+def test_load_all_projects():
+    s = vcproj.solution.parse('vcproj/tests/test_solution/vc2010.sln')
+    projects = s.load_all_projects()
+    assert sorted(projects) == ['lib1\\lib1.vcxproj', 'lib2\\lib2.vcxproj', 'test\\test.vcxproj']
+    assert list(projects['test\\test.vcxproj'].source_files()) == ['stdafx.cpp', 'test.cpp']
+
+
 def test_write():
     s = vcproj.solution.parse('vcproj/tests/test_solution/vc2010.sln')
     temp = tempfile.NamedTemporaryFile()